@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import math
 import random
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, Iterable, List, Tuple
 
 import pygame
 
@@ -45,6 +49,61 @@ DEFAULT_CONFIG: Dict[str, Dict[str, float]] = {
     "laser": {"damage_ratio": 1.0},
 }
 
+
+@dataclass(slots=True, frozen=True)
+class WindowCfg:
+    width: int
+    height: int
+    fps: int
+
+
+@dataclass(slots=True, frozen=True)
+class PlayerCfg:
+    speed: float
+    shoot_cooldown: float
+    bullet_speed: float
+    bullet_damage: float
+    bullet_count: int
+    max_health: float
+    bottom_margin: int
+
+
+@dataclass(slots=True, frozen=True)
+class EnemyCfg:
+    rows: int
+    cols: int
+    horizontal_speed: float
+    shoot_cooldown: float
+    bullet_speed: float
+    bullet_damage: float
+    spacing: int
+    start_y: int
+    padding: int
+    base_health: float
+
+
+@dataclass(slots=True, frozen=True)
+class WaveCfg:
+    speed_scaling: float
+    health_scaling: float
+    count_scaling: float
+    max_enemy_multiplier: float
+
+
+@dataclass(slots=True, frozen=True)
+class LaserCfg:
+    damage_ratio: float
+
+
+@dataclass(slots=True, frozen=True)
+class GameCfg:
+    window: WindowCfg
+    player: PlayerCfg
+    enemy: EnemyCfg
+    wave: WaveCfg
+    laser: LaserCfg
+
+
 Color = Tuple[int, int, int]
 WHITE: Color = (245, 245, 245)
 GREEN: Color = (44, 204, 112)
@@ -72,10 +131,17 @@ BOUNCY_BALL_SIZE = 36
 BOUNCY_BALL_LIFETIME = 6.0
 BOUNCY_BALL_COLLISIONS = 10
 LIGHTNING_DURATION = 0.25
+LIGHTNING_FADE_STEPS = 16
 LASER_DURATION = 0.35
 LASER_WIDTH = 8
 LASER_BURST_DELAY = 1.0
 LASER_INTERVAL = 0.1
+SPATIAL_HASH_CELL = 64
+HUD_HINTS = (
+    "Move: A/D or arrows | Click to shoot",
+    "Press F11 to toggle fullscreen",
+    "Powerup every 2 waves | Survive the barrage!",
+)
 
 
 def deep_update(base: Dict, override: Dict) -> Dict:
@@ -87,19 +153,92 @@ def deep_update(base: Dict, override: Dict) -> Dict:
     return base
 
 
-def load_config(path: Path) -> Dict[str, Dict[str, float]]:
-    config = {key: value.copy() for key, value in DEFAULT_CONFIG.items()}
-    if path.exists():
-        with path.open("rb") as fp:
-            file_config = tomllib.load(fp)
-        config = deep_update(config, file_config)
-    return config
+def freeze_config(config: Dict[str, Dict[str, float]]) -> GameCfg:
+    window = config["window"]
+    player = config["player"]
+    enemy = config["enemy"]
+    wave = config["wave"]
+    laser = config["laser"]
+    return GameCfg(
+        window=WindowCfg(width=int(window["width"]), height=int(window["height"]), fps=int(window["fps"])),
+        player=PlayerCfg(
+            speed=float(player["speed"]),
+            shoot_cooldown=float(player["shoot_cooldown"]),
+            bullet_speed=float(player["bullet_speed"]),
+            bullet_damage=float(player["bullet_damage"]),
+            bullet_count=int(player["bullet_count"]),
+            max_health=float(player["max_health"]),
+            bottom_margin=int(player["bottom_margin"]),
+        ),
+        enemy=EnemyCfg(
+            rows=int(enemy["rows"]),
+            cols=int(enemy["cols"]),
+            horizontal_speed=float(enemy["horizontal_speed"]),
+            shoot_cooldown=float(enemy["shoot_cooldown"]),
+            bullet_speed=float(enemy["bullet_speed"]),
+            bullet_damage=float(enemy["bullet_damage"]),
+            spacing=int(enemy["spacing"]),
+            start_y=int(enemy["start_y"]),
+            padding=int(enemy["padding"]),
+            base_health=float(enemy["base_health"]),
+        ),
+        wave=WaveCfg(
+            speed_scaling=float(wave["speed_scaling"]),
+            health_scaling=float(wave["health_scaling"]),
+            count_scaling=float(wave["count_scaling"]),
+            max_enemy_multiplier=float(wave["max_enemy_multiplier"]),
+        ),
+        laser=LaserCfg(damage_ratio=float(laser["damage_ratio"])),
+    )
+
+
+# Last loaded snapshot, keyed by config path and its mtime (None when the file is absent).
+_CONFIG_CACHE: Tuple[Tuple[str, int | None], GameCfg] | None = None
+
+
+def load_config(path: Path) -> GameCfg:
+    global _CONFIG_CACHE
+    try:
+        mtime: int | None = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    cache_key = (str(path), mtime)
+    if _CONFIG_CACHE is not None and _CONFIG_CACHE[0] == cache_key:
+        return _CONFIG_CACHE[1]
+    # freeze_config only reads the dict, so the defaults are copied only when a file overrides them.
+    config = DEFAULT_CONFIG
+    if mtime is not None:
+        file_config = tomllib.loads(path.read_bytes().decode("utf-8"))
+        config = deep_update({key: value.copy() for key, value in DEFAULT_CONFIG.items()}, file_config)
+    snapshot = freeze_config(config)
+    _CONFIG_CACHE = (cache_key, snapshot)
+    return snapshot
 
 
 def format_health(value: float) -> str:
     return str(int(round(value)))
 
 
+# Rendered enemy health labels keyed by rounded value; all labels share one font.
+_HEALTH_TEXT_CACHE: Dict[int, pygame.Surface] = {}
+
+
+def render_health_text(value: float, font: pygame.font.Font) -> pygame.Surface:
+    rounded = int(round(value))
+    surface = _HEALTH_TEXT_CACHE.get(rounded)
+    if surface is None:
+        label = font.render(str(rounded), True, BACKGROUND)
+        surface = _HEALTH_TEXT_CACHE[rounded] = to_display_format(label, alpha=True)
+    return surface
+
+
+def to_display_format(surface: pygame.Surface, alpha: bool = False) -> pygame.Surface:
+    # Matching the display's pixel format keeps blits on SDL's fast path; needs a window first.
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
 def build_enemy_surface(shape: str, color: Color) -> pygame.Surface:
     width, height = 50, 30
     surface = pygame.Surface((width, height), pygame.SRCALPHA)
@@ -114,10 +253,78 @@ def build_enemy_surface(shape: str, color: Color) -> pygame.Surface:
         pygame.draw.polygon(surface, color, points)
     else:
         pygame.draw.rect(surface, color, rect)
+    return to_display_format(surface, alpha=True)
+
+
+def build_bullet_surface(color: Color) -> pygame.Surface:
+    surface = pygame.Surface((6, 18))
+    surface.fill(color)
+    return to_display_format(surface)
+
+
+def build_player_surface(size: Tuple[int, int]) -> pygame.Surface:
+    surface = pygame.Surface(size)
+    surface.fill(GREEN)
+    return to_display_format(surface)
+
+
+def build_bouncy_ball_surface() -> pygame.Surface:
+    surface = pygame.Surface((BOUNCY_BALL_SIZE, BOUNCY_BALL_SIZE), pygame.SRCALPHA)
+    pygame.draw.circle(surface, CYAN, (BOUNCY_BALL_SIZE // 2, BOUNCY_BALL_SIZE // 2), BOUNCY_BALL_SIZE // 2)
+    return to_display_format(surface, alpha=True)
+
+
+def build_dim_overlay(size: Tuple[int, int]) -> pygame.Surface:
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill((0, 0, 0, 180))
+    return to_display_format(surface, alpha=True)
+
+
+def build_powerup_card_surface(size: Tuple[int, int]) -> pygame.Surface:
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.rect(surface, GREY, surface.get_rect(), border_radius=10)
+    pygame.draw.rect(surface, WHITE, surface.get_rect(), width=2, border_radius=10)
+    return to_display_format(surface, alpha=True)
+
+
+# Sprite images are never drawn onto after construction, so instances can share them.
+_SURFACE_CACHE: Dict[Tuple, pygame.Surface] = {}
+
+
+def _cached(key: Tuple, build: Callable[..., pygame.Surface], *args: object) -> pygame.Surface:
+    surface = _SURFACE_CACHE.get(key)
+    if surface is None:
+        surface = _SURFACE_CACHE[key] = build(*args)
     return surface
 
 
+def get_bullet_surface(color: Color) -> pygame.Surface:
+    return _cached(("bullet", color), build_bullet_surface, color)
+
+
+def get_player_surface(size: Tuple[int, int]) -> pygame.Surface:
+    return _cached(("player", size), build_player_surface, size)
+
+
+def get_bouncy_ball_surface() -> pygame.Surface:
+    return _cached(("bouncy_ball",), build_bouncy_ball_surface)
+
+
+def get_enemy_surface(shape: str, color: Color) -> pygame.Surface:
+    return _cached(("enemy", shape, color), build_enemy_surface, shape, color)
+
+
+def get_dim_overlay(size: Tuple[int, int]) -> pygame.Surface:
+    return _cached(("dim_overlay", size), build_dim_overlay, size)
+
+
+def get_powerup_card_surface(size: Tuple[int, int]) -> pygame.Surface:
+    return _cached(("powerup_card", size), build_powerup_card_surface, size)
+
+
 class Bullet(pygame.sprite.Sprite):
+    __slots__ = ("image", "rect", "velocity", "damage", "owner", "remaining_bounces")
+
     def __init__(
         self,
         pos: Tuple[float, float],
@@ -128,24 +335,20 @@ class Bullet(pygame.sprite.Sprite):
         remaining_bounces: int = 0,
     ):
         super().__init__()
-        self.image = pygame.Surface((6, 18))
-        self.image.fill(color)
+        self.image = get_bullet_surface(color)
         self.rect = self.image.get_rect(center=pos)
         self.velocity = pygame.Vector2(velocity)
         self.damage = float(damage)
         self.owner = owner
         self.remaining_bounces = int(remaining_bounces)
 
-    def update(self, dt: float) -> None:
-        self.rect.x += self.velocity.x * dt
-        self.rect.y += self.velocity.y * dt
-
 
 class BouncyBall(pygame.sprite.Sprite):
+    __slots__ = ("image", "rect", "velocity", "damage", "lifetime", "remaining_collisions")
+
     def __init__(self, pos: Tuple[float, float], velocity: pygame.Vector2, damage: float):
         super().__init__()
-        self.image = pygame.Surface((BOUNCY_BALL_SIZE, BOUNCY_BALL_SIZE), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, CYAN, (BOUNCY_BALL_SIZE // 2, BOUNCY_BALL_SIZE // 2), BOUNCY_BALL_SIZE // 2)
+        self.image = get_bouncy_ball_surface()
         self.rect = self.image.get_rect(center=pos)
         self.velocity = velocity
         self.damage = float(damage)
@@ -158,15 +361,19 @@ class BouncyBall(pygame.sprite.Sprite):
             self.kill()
             return
 
-        self.rect.x += self.velocity.x * dt
-        self.rect.y += self.velocity.y * dt
+        rect = self.rect
+        velocity = self.velocity
+        rect.x += velocity.x * dt
+        rect.y += velocity.y * dt
 
-        if self.rect.left <= screen_rect.left or self.rect.right >= screen_rect.right:
-            self.velocity.x *= -1
-            self.rect.clamp_ip(screen_rect)
-        if self.rect.top <= screen_rect.top or self.rect.bottom >= screen_rect.bottom:
-            self.velocity.y *= -1
-            self.rect.clamp_ip(screen_rect)
+        bounce_x = rect.left <= screen_rect.left or rect.right >= screen_rect.right
+        bounce_y = rect.top <= screen_rect.top or rect.bottom >= screen_rect.bottom
+        if bounce_x:
+            velocity.x = -velocity.x
+        if bounce_y:
+            velocity.y = -velocity.y
+        if bounce_x or bounce_y:
+            rect.clamp_ip(screen_rect)
 
     def on_collision(self) -> None:
         self.remaining_collisions -= 1
@@ -175,37 +382,71 @@ class BouncyBall(pygame.sprite.Sprite):
 
 
 class Player(pygame.sprite.Sprite):
-    def __init__(self, config: Dict[str, float], screen_rect: pygame.Rect):
+    __slots__ = (
+        "config",
+        "base_width",
+        "base_height",
+        "size_scale",
+        "image",
+        "rect",
+        "speed",
+        "shoot_cooldown",
+        "last_shot_time",
+        "bullet_speed",
+        "bullet_damage",
+        "starting_bullet_damage",
+        "bullet_count",
+        "bullet_bounce_count",
+        "max_health",
+        "health",
+        "diagonal_shot_stacks",
+        "has_thorns",
+        "chain_lightning_count",
+        "bouncy_ball_count",
+        "laser_count",
+        "_offsets",
+        "_diag_offsets",
+        "_bullet_velocity",
+    )
+
+    def __init__(self, config: PlayerCfg, screen_rect: pygame.Rect):
         super().__init__()
         self.config = config
         self.base_width = 60
         self.base_height = 28
         self.size_scale = 1.0
-        self.image = pygame.Surface((self.base_width, self.base_height))
-        self.image.fill(GREEN)
-        start_y = screen_rect.bottom - config["bottom_margin"]
+        self.image = get_player_surface((self.base_width, self.base_height))
+        start_y = screen_rect.bottom - config.bottom_margin
         self.rect = self.image.get_rect(midbottom=(screen_rect.centerx, start_y))
-        self.speed = float(config["speed"])
-        self.shoot_cooldown = float(config["shoot_cooldown"])
-        self.last_shot_time = 0.0
-        self.bullet_speed = float(config["bullet_speed"])
-        self.bullet_damage = float(config["bullet_damage"])
+        self.speed = config.speed
+        self.shoot_cooldown = config.shoot_cooldown
+        # Game time starts at 0, so back-date the last shot to allow firing on the first frame.
+        self.last_shot_time = -self.shoot_cooldown
+        self.bullet_speed = config.bullet_speed
+        self.bullet_damage = config.bullet_damage
         self.starting_bullet_damage = self.bullet_damage
-        self.bullet_count = int(config["bullet_count"])
+        self.bullet_count = config.bullet_count
         self.bullet_bounce_count = 0
-        self.max_health = float(config["max_health"])
+        self.max_health = config.max_health
         self.health = float(self.max_health)
         self.diagonal_shot_stacks = 0
         self.has_thorns = False
         self.chain_lightning_count = 0
         self.bouncy_ball_count = 0
         self.laser_count = 0
+        self._bullet_velocity = (0.0, -self.bullet_speed)
+        self._recompute_offsets()
 
     @staticmethod
-    def _build_offsets(count: int, spread: float) -> List[float]:
+    def _build_offsets(count: int, spread: float) -> Tuple[float, ...]:
         if count <= 0:
-            return []
-        return [(i - (count - 1) / 2) * spread for i in range(count)]
+            return ()
+        return tuple((i - (count - 1) / 2) * spread for i in range(count))
+
+    def _recompute_offsets(self) -> None:
+        # Shot offsets only change with bullet count or diagonal upgrades, not per trigger.
+        self._offsets = self._build_offsets(self.bullet_count, 16)
+        self._diag_offsets = self._build_offsets(self.bullet_count * self.diagonal_shot_stacks, 16)
 
     def move(self, direction: float, dt: float, screen_rect: pygame.Rect) -> None:
         self.rect.x += direction * self.speed * dt
@@ -216,16 +457,13 @@ class Player(pygame.sprite.Sprite):
             return []
         self.last_shot_time = now
         projectiles: List[pygame.sprite.Sprite] = []
-        spread = 16
-        offsets = self._build_offsets(self.bullet_count, spread)
-        for offset in offsets:
+        for offset in self._offsets:
             pos = (self.rect.centerx + offset, self.rect.top)
-            bullet = Bullet(pos, (0, -self.bullet_speed), BLUE, self.bullet_damage, remaining_bounces=self.bullet_bounce_count)
+            bullet = Bullet(pos, self._bullet_velocity, BLUE, self.bullet_damage, remaining_bounces=self.bullet_bounce_count)
             projectiles.append(bullet)
-        if self.diagonal_shot_stacks > 0:
+        diag_offsets = self._diag_offsets
+        if diag_offsets:
             diag_speed = self.bullet_speed * 0.6
-            diag_per_side = self.bullet_count * self.diagonal_shot_stacks
-            diag_offsets = self._build_offsets(diag_per_side, spread)
             for offset in diag_offsets:
                 pos = (self.rect.centerx + offset, self.rect.top)
                 projectiles.append(
@@ -258,6 +496,7 @@ class Player(pygame.sprite.Sprite):
 
     def upgrade_bullet_count(self, amount: int = 1, cap: int = 6) -> None:
         self.bullet_count = min(cap, self.bullet_count + amount)
+        self._recompute_offsets()
 
     def upgrade_speed(self, amount: float = 100.0) -> None:
         self.speed += amount
@@ -267,6 +506,10 @@ class Player(pygame.sprite.Sprite):
 
     def add_diagonal_shot(self) -> None:
         self.diagonal_shot_stacks += 1
+        self._recompute_offsets()
+
+    def add_thorns(self) -> None:
+        self.has_thorns = True
 
     def add_chain_lightning(self) -> None:
         self.chain_lightning_count += 1
@@ -285,16 +528,30 @@ class Player(pygame.sprite.Sprite):
         width = max(8, int(self.base_width * self.size_scale))
         height = max(6, int(self.base_height * self.size_scale))
         midbottom = self.rect.midbottom
-        self.image = pygame.Surface((width, height))
-        self.image.fill(GREEN)
+        self.image = get_player_surface((width, height))
         self.rect = self.image.get_rect(midbottom=midbottom)
 
 
 class Enemy(pygame.sprite.Sprite):
+    __slots__ = (
+        "base_width",
+        "base_height",
+        "image",
+        "rect",
+        "direction",
+        "speed",
+        "health",
+        "shoot_cooldown",
+        "next_shot_time",
+        "bullet_speed",
+        "bullet_damage",
+        "bullet_count",
+    )
+
     def __init__(
         self,
         pos: Tuple[float, float],
-        config: Dict[str, float],
+        config: EnemyCfg,
         speed_multiplier: float,
         health_multiplier: float,
         shape: str,
@@ -304,22 +561,23 @@ class Enemy(pygame.sprite.Sprite):
         super().__init__()
         self.base_width = 50
         self.base_height = 30
-        self.image = build_enemy_surface(shape, color)
+        self.image = get_enemy_surface(shape, color)
         self.rect = self.image.get_rect(center=pos)
         self.direction = 1
-        self.speed = float(config["horizontal_speed"]) * speed_multiplier
-        base_health = float(config["base_health"])
-        self.health = max(1.0, base_health * health_multiplier)
-        self.shoot_cooldown = float(config["shoot_cooldown"]) / (0.8 + speed_multiplier * 0.2)
-        self.last_shot_time = 0.0
-        self.bullet_speed = float(config["bullet_speed"])
-        self.bullet_damage = float(config["bullet_damage"])
+        self.speed = config.horizontal_speed * speed_multiplier
+        self.health = max(1.0, config.base_health * health_multiplier)
+        self.shoot_cooldown = config.shoot_cooldown / (0.8 + speed_multiplier * 0.2)
+        # Earliest time the enemy may fire again; checked before rolling the fire chance.
+        self.next_shot_time = self.shoot_cooldown
+        self.bullet_speed = config.bullet_speed
+        self.bullet_damage = config.bullet_damage
         self.bullet_count = max(1, int(bullet_count))
 
-    def update(self, dt: float, screen_rect: pygame.Rect) -> None:
-        self.rect.x += self.direction * self.speed * dt
-        if self.rect.left <= screen_rect.left + 20 or self.rect.right >= screen_rect.right - 20:
-            self.direction *= -1
+    def update(self, dt: float, left_bound: int, right_bound: int) -> None:
+        rect = self.rect
+        rect.x += self.direction * self.speed * dt
+        if rect.left <= left_bound or rect.right >= right_bound:
+            self.direction = -self.direction
 
     @staticmethod
     def _build_offsets(count: int, spread: float) -> List[float]:
@@ -328,11 +586,11 @@ class Enemy(pygame.sprite.Sprite):
         return [(i - (count - 1) / 2) * spread for i in range(count)]
 
     def try_shoot(self, now: float) -> List[Bullet]:
-        if now - self.last_shot_time < self.shoot_cooldown:
+        if now < self.next_shot_time:
             return []
         # Slight randomness so not all enemies fire simultaneously.
         if random.random() < 0.25:
-            self.last_shot_time = now
+            self.next_shot_time = now + self.shoot_cooldown
             spread = 24
             offsets = self._build_offsets(self.bullet_count, spread)
             return [
@@ -348,156 +606,243 @@ class Enemy(pygame.sprite.Sprite):
         return []
 
 
-Powerup = Tuple[str, str, Callable[[Player], None]]
+class SpatialHash:
+    def __init__(self, cell_size: int = SPATIAL_HASH_CELL):
+        self.cell_size = cell_size
+        self.cells: Dict[Tuple[int, int], List[pygame.sprite.Sprite]] = defaultdict(list)
+
+    def clear(self) -> None:
+        self.cells.clear()
+
+    def insert(self, sprite: pygame.sprite.Sprite) -> None:
+        cell = self.cell_size
+        rect = sprite.rect
+        cells = self.cells
+        for cx in range(rect.left // cell, rect.right // cell + 1):
+            for cy in range(rect.top // cell, rect.bottom // cell + 1):
+                cells[(cx, cy)].append(sprite)
+
+    def rebuild(self, sprites: pygame.sprite.Group) -> None:
+        self.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def query(self, rect: pygame.Rect) -> List[pygame.sprite.Sprite]:
+        cell = self.cell_size
+        cells = self.cells
+        left, right = rect.left // cell, rect.right // cell
+        top, bottom = rect.top // cell, rect.bottom // cell
+        if left == right and top == bottom:
+            candidates = cells.get((left, top))
+            if not candidates:
+                return []
+        else:
+            seen = set()
+            candidates = []
+            for cx in range(left, right + 1):
+                for cy in range(top, bottom + 1):
+                    for sprite in cells.get((cx, cy), ()):
+                        if id(sprite) not in seen:
+                            seen.add(id(sprite))
+                            candidates.append(sprite)
+        # Narrow phase runs in C over the bucket; entries go stale when a sprite is removed
+        # mid-frame, so dead ones are skipped.
+        return [
+            candidates[idx]
+            for idx in rect.collidelistall([sprite.rect for sprite in candidates])
+            if candidates[idx].alive()
+        ]
 
 
-def build_powerups() -> List[Powerup]:
-    return [
-        (
-            "Increased Damage",
-            "+1 bullet damage.",
-            lambda player: player.upgrade_damage(1),
-        ),
-        (
-            "Increased Attack Speed",
-            "Fire faster by 25%.",
-            lambda player: player.upgrade_attack_speed(0.75),
-        ),
-        (
-            "Increased Number of Bullets",
-            "Add one more projectile per shot.",
-            lambda player: player.upgrade_bullet_count(1),
-        ),
-        (
-            "Increased Movement Speed",
-            "+100 units movement speed.",
-            lambda player: player.upgrade_speed(100.0),
-        ),
-        (
-            "Heal",
-            "Recover 40% of your max HP.",
-            lambda player: player.heal_percentage(0.4),
-        ),
-        (
-            "Split Shot",
-            "Gain two diagonal bullets each attack.",
-            lambda player: player.add_diagonal_shot(),
-        ),
-        (
-            "Thorns",
-            "When hit, also destroy the attacking enemy.",
-            lambda player: setattr(player, "has_thorns", True),
-        ),
-        (
-            "Chain Lightning",
-            "Shots chain between 4 enemies for half damage.",
-            lambda player: player.add_chain_lightning(),
-        ),
-        (
-            "Bouncy Ball",
-            "A bouncing orb patrols the arena for half bullet damage.",
-            lambda player: player.add_bouncy_ball(),
-        ),
-        (
-            "Bullet Ricochet",
-            "Shots bounce off walls once. Stacks for more bounces.",
-            lambda player: player.add_bullet_bounce(),
-        ),
-        (
-            "Shrink",
-            "Reduce your size by 20%, making you harder to hit. Stacks.",
-            lambda player: player.shrink_size(),
-        ),
-        (
-            "Laser Barrage",
-            "Every second, unleash a sweeping laser volley that grows with stacks.",
-            lambda player: player.add_laser_barrage(),
-        ),
-    ]
+Powerup = Tuple[str, str, Callable[[Player], None]]
 
 
-def create_wave(wave: int, config: Dict[str, Dict[str, float]], screen_rect: pygame.Rect) -> pygame.sprite.Group:
-    enemies = pygame.sprite.Group()
-    enemy_cfg = config["enemy"]
-    row_count = enemy_cfg["rows"]
-    col_count = enemy_cfg["cols"]
+POWERUPS: Tuple[Powerup, ...] = (
+    (
+        "Increased Damage",
+        "+1 bullet damage.",
+        partial(Player.upgrade_damage, amount=1),
+    ),
+    (
+        "Increased Attack Speed",
+        "Fire faster by 25%.",
+        partial(Player.upgrade_attack_speed, factor=0.75),
+    ),
+    (
+        "Increased Number of Bullets",
+        "Add one more projectile per shot.",
+        partial(Player.upgrade_bullet_count, amount=1),
+    ),
+    (
+        "Increased Movement Speed",
+        "+100 units movement speed.",
+        partial(Player.upgrade_speed, amount=100.0),
+    ),
+    (
+        "Heal",
+        "Recover 40% of your max HP.",
+        partial(Player.heal_percentage, pct=0.4),
+    ),
+    (
+        "Split Shot",
+        "Gain two diagonal bullets each attack.",
+        Player.add_diagonal_shot,
+    ),
+    (
+        "Thorns",
+        "When hit, also destroy the attacking enemy.",
+        Player.add_thorns,
+    ),
+    (
+        "Chain Lightning",
+        "Shots chain between 4 enemies for half damage.",
+        Player.add_chain_lightning,
+    ),
+    (
+        "Bouncy Ball",
+        "A bouncing orb patrols the arena for half bullet damage.",
+        Player.add_bouncy_ball,
+    ),
+    (
+        "Bullet Ricochet",
+        "Shots bounce off walls once. Stacks for more bounces.",
+        Player.add_bullet_bounce,
+    ),
+    (
+        "Shrink",
+        "Reduce your size by 20%, making you harder to hit. Stacks.",
+        Player.shrink_size,
+    ),
+    (
+        "Laser Barrage",
+        "Every second, unleash a sweeping laser volley that grows with stacks.",
+        Player.add_laser_barrage,
+    ),
+)
+
+
+def create_wave(wave: int, config: GameCfg, screen_rect: pygame.Rect) -> pygame.sprite.Group:
+    enemy_cfg = config.enemy
+    wave_cfg = config.wave
+    row_count = enemy_cfg.rows
+    col_count = enemy_cfg.cols
     base_total = row_count * col_count
-    additional = math.ceil(base_total * config["wave"]["count_scaling"] * (wave - 1))
+    additional = math.ceil(base_total * wave_cfg.count_scaling * (wave - 1))
     total = base_total + additional
-    speed_multiplier = 1 + (wave - 1) * config["wave"]["speed_scaling"]
-    health_multiplier = 1 + (wave - 1) * config["wave"]["health_scaling"]
+    speed_multiplier = 1 + (wave - 1) * wave_cfg.speed_scaling
+    health_multiplier = 1 + (wave - 1) * wave_cfg.health_scaling
     bullet_count = 1
-    max_multiplier = float(config["wave"].get("max_enemy_multiplier", 6))
+    max_multiplier = wave_cfg.max_enemy_multiplier
     if total > base_total * max_multiplier:
-        additional = math.ceil((base_total * config["wave"]["count_scaling"] * (wave - 1))/max_multiplier)
+        additional = math.ceil((base_total * wave_cfg.count_scaling * (wave - 1))/max_multiplier)
         total = base_total + additional
         health_multiplier *= max_multiplier * 3
         bullet_count *= 2
-    spacing = enemy_cfg["spacing"]
-    start_y = enemy_cfg["start_y"]
-    padding = enemy_cfg["padding"]
+    spacing = enemy_cfg.spacing
+    start_y = enemy_cfg.start_y
+    padding = enemy_cfg.padding
 
     cols = max(1, int(min(col_count + wave // 2, (screen_rect.width - padding * 2) // spacing)))
-    for idx in range(total):
-        row = idx // cols
-        col = idx % cols
-        x = padding + col * spacing
-        y = start_y + row * spacing
-        x = min(max(padding, x), screen_rect.width - padding)
-        if wave >= 3:
-            shape, color = random.choice(ENEMY_SHAPES)
-        else:
-            shape, color = BASIC_ENEMY_SHAPE, YELLOW
-        enemy = Enemy((x, y), enemy_cfg, speed_multiplier, health_multiplier, shape, color, bullet_count)
-        enemies.add(enemy)
-    return enemies
+    # Every row shares the same clamped column offsets, so compute them once per wave.
+    max_x = screen_rect.width - padding
+    col_xs = [min(max(padding, padding + col * spacing), max_x) for col in range(cols)]
+    positions = [(col_xs[col], start_y + row * spacing) for row, col in (divmod(idx, cols) for idx in range(total))]
+    if wave >= 3:
+        styles = random.choices(ENEMY_SHAPES, k=total)
+    else:
+        styles = [(BASIC_ENEMY_SHAPE, YELLOW)] * total
+    return pygame.sprite.Group(
+        [
+            Enemy(pos, enemy_cfg, speed_multiplier, health_multiplier, shape, color, bullet_count)
+            for pos, (shape, color) in zip(positions, styles)
+        ]
+    )
 
 
-def build_lightning_polyline(start: pygame.Vector2, end: pygame.Vector2) -> List[pygame.Vector2]:
-    direction = end - start
-    length = direction.length()
+def build_lightning_polyline(start: Tuple[int, int], end: Tuple[int, int]) -> List[Tuple[int, int]]:
+    sx, sy = start
+    ex, ey = end
+    dx = ex - sx
+    dy = ey - sy
+    length = math.hypot(dx, dy)
     if length == 0:
         return [start, end]
-    direction = direction.normalize()
-    perpendicular = pygame.Vector2(-direction.y, direction.x)
+    perp_x = -dy / length
+    perp_y = dx / length
     segments = max(2, int(length // 35))
+    step_x = dx / segments
+    step_y = dy / segments
+    uniform = random.uniform
     points = [start]
     for i in range(1, segments):
-        t = i / segments
-        offset = perpendicular * random.uniform(-10, 10)
-        points.append(start + direction * length * t + offset)
+        offset = uniform(-10, 10)
+        points.append((int(sx + step_x * i + perp_x * offset), int(sy + step_y * i + perp_y * offset)))
     points.append(end)
     return points
 
 
 def chain_lightning_strike(
     start_enemy: Enemy, enemies: pygame.sprite.Group, damage: float, max_bounces: int = 4
-) -> List[Tuple[pygame.Vector2, pygame.Vector2]]:
-    remaining_targets = [e for e in enemies if e is not start_enemy]
-    current_pos = pygame.Vector2(start_enemy.rect.center)
-    segments: List[Tuple[pygame.Vector2, pygame.Vector2]] = []
+) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+    centers = [(e.rect.centerx, e.rect.centery, e) for e in enemies if e is not start_enemy]
+    cx, cy = start_enemy.rect.center
+    current_pos = (cx, cy)
+    segments: List[Tuple[Tuple[int, int], Tuple[int, int]]] = []
     for _ in range(max_bounces):
-        if not remaining_targets:
+        if not centers:
             break
-        target = min(remaining_targets, key=lambda e: pygame.Vector2(e.rect.center).distance_to(current_pos))
+        # Squared distances order targets the same as real ones without the sqrt.
+        best_idx = 0
+        best_dist = -1
+        for idx, (x, y, _) in enumerate(centers):
+            dist = (x - cx) * (x - cx) + (y - cy) * (y - cy)
+            if best_dist < 0 or dist < best_dist:
+                best_idx = idx
+                best_dist = dist
+        cx, cy, target = centers[best_idx]
+        # Swap with the tail so removing the target is O(1).
+        centers[best_idx] = centers[-1]
+        centers.pop()
         target.health -= damage
-        target_center = pygame.Vector2(target.rect.center)
+        target_center = (cx, cy)
         segments.append((current_pos, target_center))
         current_pos = target_center
         if target.health <= 0:
-            enemies.remove(target)
-            remaining_targets = [e for e in remaining_targets if e is not target]
-        else:
-            remaining_targets = [e for e in remaining_targets if e is not target]
+            target.kill()
     return segments
 
 
-def create_lightning_effect(segments: List[Tuple[pygame.Vector2, pygame.Vector2]]) -> List[List[pygame.Vector2]]:
+def create_lightning_effect(segments: List[Tuple[Tuple[int, int], Tuple[int, int]]]) -> List[List[Tuple[int, int]]]:
     return [build_lightning_polyline(start, end) for start, end in segments]
 
 
+@dataclass(slots=True)
+class LightningEffect:
+    timer: float
+    polylines: List[List[Tuple[int, int]]]
+
+
+def build_lightning_styles(steps: int = LIGHTNING_FADE_STEPS) -> List[Tuple[Color, Color, int]]:
+    styles: List[Tuple[Color, Color, int]] = []
+    for step in range(steps + 1):
+        intensity = step / steps
+        core_color = tuple(
+            int(LIGHTNING_COLOR[i] * intensity + WHITE[i] * (1.0 - intensity) * 0.5) for i in range(3)
+        )
+        glow_color = tuple(min(255, int(value * 1.15)) for value in core_color)
+        line_width = max(1, int(4 * intensity))
+        styles.append((core_color, glow_color, line_width))
+    return styles
+
+
+# (core color, glow color, line width) per fade step, indexed by remaining intensity.
+LIGHTNING_STYLES = build_lightning_styles()
+
+
 def ensure_bouncy_ball_active(
-    player: Player, bouncy_balls: pygame.sprite.Group, screen_rect: pygame.Rect
+    player: Player,
+    bouncy_balls: pygame.sprite.Group,
+    screen_rect: pygame.Rect,
 ) -> None:
     desired_count = player.bouncy_ball_count
     while len(bouncy_balls) < desired_count:
@@ -533,6 +878,24 @@ def bounce_bullet_off_walls(bullet: Bullet, screen_rect: pygame.Rect) -> bool:
     return True
 
 
+def step_bullets(bullets: Iterable[Bullet], dt: float, bounds: pygame.Rect) -> None:
+    # Advances a whole group in one loop instead of dispatching Bullet.update per sprite.
+    # Shots strictly inside the bounds cannot touch a wall, so one contains() skips the bounce test.
+    inner = bounds.inflate(-2, -2)
+    bottom = bounds.bottom
+    for bullet in bullets:
+        rect = bullet.rect
+        vx, vy = bullet.velocity
+        rect.x += vx * dt
+        rect.y += vy * dt
+        # Player shots ricochet off (or die at) the walls; enemy shots fall off the bottom.
+        if bullet.owner is None:
+            if not inner.contains(rect) and not bounce_bullet_off_walls(bullet, bounds):
+                bullet.kill()
+        elif rect.top > bottom:
+            bullet.kill()
+
+
 def random_wall_point(rect: pygame.Rect, wall: str) -> pygame.Vector2:
     if wall in ("top", "bottom"):
         x = random.uniform(rect.left, rect.right)
@@ -580,12 +943,24 @@ def laser_hits_rect(laser: Dict[str, object], target_rect: pygame.Rect) -> bool:
     return bool(clipped)
 
 
-def get_laser_damage(player: Player, laser_config: Dict[str, float]) -> float:
-    ratio = float(laser_config.get("damage_ratio", 1.0))
+def get_laser_damage(player: Player, laser_config: LaserCfg) -> float:
+    ratio = laser_config.damage_ratio
     starting_damage = max(0.0001, player.starting_bullet_damage)
     return ratio * (player.bullet_damage / starting_damage)
 
 
+# Rendered overlay text keyed by (text, color, font); the set of strings drawn through here is small and fixed.
+_TEXT_CACHE: Dict[Tuple[str, Color, pygame.font.Font], pygame.Surface] = {}
+
+
+def render_text(text: str, font: pygame.font.Font, color: Color) -> pygame.Surface:
+    key = (text, color, font)
+    rendered = _TEXT_CACHE.get(key)
+    if rendered is None:
+        rendered = _TEXT_CACHE[key] = font.render(text, True, color)
+    return rendered
+
+
 def draw_text(
     surface: pygame.Surface,
     text: str,
@@ -594,11 +969,22 @@ def draw_text(
     pos: Tuple[int, int],
     align: str = "topleft",
 ) -> None:
-    rendered = font.render(text, True, color)
+    rendered = render_text(text, font, color)
     rect = rendered.get_rect(**{align: pos})
     surface.blit(rendered, rect)
 
 
+def build_hint_blits(font: pygame.font.Font) -> List[Tuple[pygame.Surface, Tuple[int, int]]]:
+    return [(render_text(hint, font, GREY), (16, 60 + idx * 24)) for idx, hint in enumerate(HUD_HINTS)]
+
+
+def paint_background(background: pygame.Surface, color: Color = BACKGROUND) -> pygame.Surface:
+    width, height = background.get_size()
+    background.fill(color)
+    background.fill(GREY, (0, height - 12, width, 12))
+    return background
+
+
 def wrap_text(text: str, font: pygame.font.Font, max_width: int) -> List[str]:
     words = text.split()
     lines: List[str] = []
@@ -632,7 +1018,7 @@ def draw_wrapped_text(
     total_height = line_height * len(lines) + line_spacing * (len(lines) - 1)
     y = rect.centery - total_height / 2
     for line in lines:
-        rendered = font.render(line, True, color)
+        rendered = render_text(line, font, color)
         text_rect = rendered.get_rect(center=(rect.centerx, int(y + line_height / 2)))
         surface.blit(rendered, text_rect)
         y += line_height + line_spacing
@@ -645,9 +1031,7 @@ def draw_powerup_overlay(
     choices: List[Powerup],
     card_rects: List[pygame.Rect],
 ) -> None:
-    overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    surface.blit(overlay, (0, 0))
+    surface.blit(get_dim_overlay(surface.get_size()), (0, 0))
     draw_text(
         surface,
         "Choose a powerup (press 1-3 or click)",
@@ -657,8 +1041,7 @@ def draw_powerup_overlay(
         "center",
     )
     for idx, (card_rect, (name, desc, _)) in enumerate(zip(card_rects, choices)):
-        pygame.draw.rect(surface, GREY, card_rect, border_radius=10)
-        pygame.draw.rect(surface, WHITE, card_rect, width=2, border_radius=10)
+        surface.blit(get_powerup_card_surface(card_rect.size), card_rect)
         draw_text(surface, f"{idx + 1}. {name}", font, WHITE, (card_rect.centerx, card_rect.top + 16), "center")
         desc_rect = card_rect.inflate(-32, -72)
         draw_wrapped_text(surface, desc, font, WHITE, desc_rect)
@@ -671,9 +1054,7 @@ def draw_pause_overlay(
     title_font: pygame.font.Font,
     collected_powerups: Dict[str, int],
 ) -> None:
-    overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
-    overlay.fill((0, 0, 0, 180))
-    surface.blit(overlay, (0, 0))
+    surface.blit(get_dim_overlay(surface.get_size()), (0, 0))
     draw_text(surface, "Paused", title_font, WHITE, (surface.get_width() // 2, 140), "center")
     draw_text(surface, "Press P to resume", font, GREY, (surface.get_width() // 2, 180), "center")
     draw_text(surface, "Upgrades collected", font, WHITE, (surface.get_width() // 2, 220), "center")
@@ -699,7 +1080,7 @@ def build_powerup_card_rects(surface: pygame.Surface, card_count: int) -> List[p
 
 
 def reset_game(
-    config: Dict[str, Dict[str, float]],
+    config: GameCfg,
     screen_rect: pygame.Rect,
 ) -> Tuple[
     Player,
@@ -711,7 +1092,7 @@ def reset_game(
     str,
     Dict[str, int],
 ]:
-    player = Player(config["player"], screen_rect)
+    player = Player(config.player, screen_rect)
     enemies = create_wave(1, config, screen_rect)
     player_bullets = pygame.sprite.Group()
     enemy_bullets = pygame.sprite.Group()
@@ -719,27 +1100,42 @@ def reset_game(
     wave = 1
     state = "playing"
     collected_powerups: Dict[str, int] = {}
-    return player, enemies, player_bullets, enemy_bullets, bouncy_balls, wave, state, collected_powerups
+    return (
+        player,
+        enemies,
+        player_bullets,
+        enemy_bullets,
+        bouncy_balls,
+        wave,
+        state,
+        collected_powerups,
+    )
 
 
-def set_display_mode(fullscreen: bool, config: Dict[str, Dict[str, float]]) -> Tuple[pygame.Surface, pygame.Rect]:
+def set_display_mode(fullscreen: bool, config: GameCfg) -> Tuple[pygame.Surface, pygame.Rect]:
     if fullscreen:
         screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
     else:
-        screen = pygame.display.set_mode((int(config["window"]["width"]), int(config["window"]["height"])))
+        screen = pygame.display.set_mode((config.window.width, config.window.height))
+    # Cached sprite surfaces and health labels were converted for the previous display format.
+    _SURFACE_CACHE.clear()
+    _HEALTH_TEXT_CACHE.clear()
     return screen, screen.get_rect()
 
 
 def main() -> None:
     config_path = Path("config.toml")
-    config = load_config(config_path)
-    pygame.init()
+    # Parse the config while SDL and the fonts initialise; nothing reads it before the window opens.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        config_future = executor.submit(load_config, config_path)
+        pygame.init()
+        font = pygame.font.SysFont("arial", 20)
+        title_font = pygame.font.SysFont("arial", 30, bold=True)
+        config = config_future.result()
     fullscreen = True
     screen, screen_rect = set_display_mode(fullscreen, config)
     pygame.display.set_caption("ShootyUppy - Click to shoot")
     clock = pygame.time.Clock()
-    font = pygame.font.SysFont("arial", 20)
-    title_font = pygame.font.SysFont("arial", 30, bold=True)
 
     (
         player,
@@ -751,19 +1147,44 @@ def main() -> None:
         state,
         collected_powerups,
     ) = reset_game(config, screen_rect)
-    lightning_effects: List[Dict[str, object]] = []
+    lightning_effects: List[LightningEffect] = []
     running = True
     # playing | choosing | paused | game_over
     powerup_mouse_block_until = 0.0
     powerup_choices: List[Powerup] = []
     powerup_card_rects: List[pygame.Rect] = []
-    powerups = build_powerups()
     pending_wave: int | None = None
     damage_flash_timer = 0.0
     lasers: List[Dict[str, object]] = []
     next_laser_burst = LASER_BURST_DELAY
     lasers_left_in_burst = 0
     next_laser_in_burst = 0.0
+    # Cells about one enemy slot wide keep each enemy in one or two buckets.
+    enemy_grid = SpatialHash(max(SPATIAL_HASH_CELL, config.enemy.spacing))
+    fps = config.window.fps
+    tick = clock.tick
+    # Game time in seconds, advanced by the same clock.tick() result that drives dt.
+    now = 0.0
+    event_get = pygame.event.get
+    get_pressed = pygame.key.get_pressed
+    get_mouse_pressed = pygame.mouse.get_pressed
+    flip = pygame.display.flip
+    get_active = pygame.display.get_active
+    wait = pygame.time.wait
+    QUIT = pygame.QUIT
+    KEYDOWN = pygame.KEYDOWN
+    MOUSEBUTTONDOWN = pygame.MOUSEBUTTONDOWN
+    K_ESCAPE = pygame.K_ESCAPE
+    K_F11 = pygame.K_F11
+    K_P, K_R = pygame.K_p, pygame.K_r
+    K_A, K_D, K_LEFT, K_RIGHT = pygame.K_a, pygame.K_d, pygame.K_LEFT, pygame.K_RIGHT
+    # Hint lines stay on top of sprites and effects, so they are blitted after them each frame.
+    hint_blits = build_hint_blits(font)
+    # Dynamic HUD lines are only re-rendered when the values they show change.
+    hud_wave_key: Tuple[int, int] | None = None
+    hud_wave_surf = pygame.Surface((0, 0))
+    hud_health_key: Tuple[str, str] | None = None
+    hud_health_surf = pygame.Surface((0, 0))
 
     def apply_powerup_choice(choice_index: int) -> None:
         nonlocal state, enemies, pending_wave, powerup_choices, powerup_mouse_block_until, powerup_card_rects
@@ -781,21 +1202,20 @@ def main() -> None:
         ensure_bouncy_ball_active(player, bouncy_balls, screen_rect)
 
     while running:
-        dt = clock.tick(config["window"]["fps"]) / 1000.0
-        now = pygame.time.get_ticks() / 1000.0
+        dt = tick(fps) / 1000.0
+        now += dt
         damage_flash_timer = max(0.0, damage_flash_timer - dt)
-        for effect in list(lightning_effects):
-            effect["timer"] = float(effect["timer"]) - dt
-            if effect["timer"] <= 0:
-                lightning_effects.remove(effect)
+        for effect in lightning_effects:
+            effect.timer -= dt
+        lightning_effects = [effect for effect in lightning_effects if effect.timer > 0]
 
         mouse_shoot_queued = False
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        for event in event_get():
+            if event.type == QUIT:
                 running = False
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+            if event.type == KEYDOWN and event.key == K_ESCAPE:
                 running = False
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+            if event.type == KEYDOWN and event.key == K_F11:
                 fullscreen = not fullscreen
                 screen, screen_rect = set_display_mode(fullscreen, config)
                 pygame.display.set_caption("ShootyUppy - Click to shoot")
@@ -806,7 +1226,7 @@ def main() -> None:
                     ball.rect.clamp_ip(screen_rect)
                 if state == "choosing":
                     powerup_card_rects = build_powerup_card_rects(screen, len(powerup_choices))
-            if state == "game_over" and event.type == pygame.KEYDOWN and event.key == pygame.K_r:
+            if state == "game_over" and event.type == KEYDOWN and event.key == K_R:
                 (
                     player,
                     enemies,
@@ -826,20 +1246,20 @@ def main() -> None:
                 next_laser_burst = LASER_BURST_DELAY
                 lasers_left_in_burst = 0
                 next_laser_in_burst = 0.0
-            if state == "playing" and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if state == "playing" and event.type == MOUSEBUTTONDOWN and event.button == 1:
                 mouse_shoot_queued = True
-            if event.type == pygame.KEYDOWN and event.key == pygame.K_p:
+            if event.type == KEYDOWN and event.key == K_P:
                 if state == "playing":
                     state = "paused"
                 elif state == "paused":
                     state = "playing"
-            if state == "choosing" and event.type == pygame.KEYDOWN:
+            if state == "choosing" and event.type == KEYDOWN:
                 choice_index = None
                 if event.unicode in ("1", "2", "3"):
                     choice_index = int(event.unicode) - 1
                 if choice_index is not None:
                     apply_powerup_choice(choice_index)
-            if state == "choosing" and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if state == "choosing" and event.type == MOUSEBUTTONDOWN and event.button == 1:
                 if now < powerup_mouse_block_until:
                     continue
                 pos = pygame.Vector2(event.pos)
@@ -850,14 +1270,17 @@ def main() -> None:
                 else:
                     continue
 
-        mouse_pressed = pygame.mouse.get_pressed()
-        keys = pygame.key.get_pressed()
+        # While minimised, keep answering events but skip simulation and drawing. The extra
+        # tick() keeps the idle time out of the next frame's dt.
+        if not get_active():
+            wait(100)
+            tick()
+            continue
+
         if state == "playing":
-            direction = 0.0
-            if keys[pygame.K_a] or keys[pygame.K_LEFT]:
-                direction -= 1
-            if keys[pygame.K_d] or keys[pygame.K_RIGHT]:
-                direction += 1
+            mouse_pressed = get_mouse_pressed()
+            keys = get_pressed()
+            direction = float((keys[K_D] or keys[K_RIGHT]) - (keys[K_A] or keys[K_LEFT]))
             player.move(direction, dt, screen_rect)
 
             if mouse_pressed[0] or mouse_shoot_queued:
@@ -869,18 +1292,13 @@ def main() -> None:
                         player_bullets.add(projectile)
 
             ensure_bouncy_ball_active(player, bouncy_balls, screen_rect)
-            player_bullets.update(dt)
-            enemy_bullets.update(dt)
+            # step_bullets also culls shots that leave the screen.
+            step_bullets(player_bullets.sprites(), dt, screen_rect)
+            step_bullets(enemy_bullets.sprites(), dt, screen_rect)
             bouncy_balls.update(dt, screen_rect)
-            enemies.update(dt, screen_rect)
-
-            # Remove bullets off-screen.
-            for bullet in list(player_bullets):
-                if not bounce_bullet_off_walls(bullet, screen_rect):
-                    player_bullets.remove(bullet)
-            for bullet in list(enemy_bullets):
-                if bullet.rect.top > screen_rect.height:
-                    enemy_bullets.remove(bullet)
+            # Enemies turn 20px short of either wall; the bounds are shared by the whole wave.
+            enemies.update(dt, screen_rect.left + 20, screen_rect.right - 20)
+            enemy_grid.rebuild(enemies)
 
             if player.laser_count > 0:
                 if now >= next_laser_burst and lasers_left_in_burst == 0:
@@ -892,19 +1310,21 @@ def main() -> None:
                     lasers_left_in_burst -= 1
                     next_laser_in_burst = now + LASER_INTERVAL
 
-            laser_damage = get_laser_damage(player, config.get("laser", {}))
-            for laser in list(lasers):
+            laser_damage = get_laser_damage(player, config.laser)
+            active_lasers: List[Dict[str, object]] = []
+            for laser in lasers:
                 laser["timer"] = float(laser["timer"]) - dt
                 if laser["timer"] <= 0:
-                    lasers.remove(laser)
                     continue
+                active_lasers.append(laser)
                 damaged_enemies = laser.setdefault("damaged_enemies", set())
                 hits = [enemy for enemy in enemies if enemy not in damaged_enemies and laser_hits_rect(laser, enemy.rect)]
                 for enemy in hits:
                     enemy.health -= laser_damage
                     damaged_enemies.add(enemy)
                     if enemy.health <= 0:
-                        enemies.remove(enemy)
+                        enemy.kill()
+            lasers = active_lasers
 
             # Enemy shooting back.
             for enemy in enemies:
@@ -913,59 +1333,58 @@ def main() -> None:
                     enemy_bullets.add(*shots)
 
             # Collisions: player bullets vs enemies.
-            for bullet in list(player_bullets):
-                hits = [e for e in enemies if e.rect.colliderect(bullet.rect)]
+            for bullet in player_bullets.sprites():
+                hits = enemy_grid.query(bullet.rect)
                 if hits:
-                    start_enemy = next((hit for hit in hits if hit in enemies), None)
+                    # The grid only returns live enemies, so the first hit is a valid chain origin.
+                    start_enemy = hits[0]
                     for hit in hits:
                         hit.health -= bullet.damage
                         if hit.health <= 0:
-                            enemies.remove(hit)
-                    if player.chain_lightning_count and start_enemy:
+                            hit.kill()
+                    if player.chain_lightning_count:
                         for _ in range(player.chain_lightning_count):
                             segments = chain_lightning_strike(start_enemy, enemies, bullet.damage * 0.5)
                             if segments:
                                 lightning_effects.append(
-                                    {"timer": LIGHTNING_DURATION, "polylines": create_lightning_effect(segments)}
+                                    LightningEffect(LIGHTNING_DURATION, create_lightning_effect(segments))
                                 )
-                    player_bullets.remove(bullet)
+                    bullet.kill()
 
             # Collisions: bouncy balls vs enemies.
-            for ball in list(bouncy_balls):
-                hits = [e for e in enemies if e.rect.colliderect(ball.rect)]
+            for ball in bouncy_balls.sprites():
+                hits = enemy_grid.query(ball.rect)
                 if hits:
-                    start_enemy = next((hit for hit in hits if hit in enemies), None)
+                    start_enemy = hits[0]
                     for hit in hits:
                         hit.health -= ball.damage
                         if hit.health <= 0:
-                            enemies.remove(hit)
-                    if player.chain_lightning_count and start_enemy:
+                            hit.kill()
+                    if player.chain_lightning_count:
                         for _ in range(player.chain_lightning_count):
                             segments = chain_lightning_strike(start_enemy, enemies, ball.damage * 0.5)
                             if segments:
                                 lightning_effects.append(
-                                    {"timer": LIGHTNING_DURATION, "polylines": create_lightning_effect(segments)}
+                                    LightningEffect(LIGHTNING_DURATION, create_lightning_effect(segments))
                                 )
                     ball.on_collision()
 
             # Collisions: enemy bullets vs player.
-            for bullet in list(enemy_bullets):
-                if player.rect.colliderect(bullet.rect):
-                    player.health = max(0.0, player.health - bullet.damage)
-                    damage_flash_timer = DAMAGE_FLASH_DURATION
-                    owner = getattr(bullet, "owner", None)
-                    if player.has_thorns and owner in enemies:
-                        enemies.remove(owner)
-                    enemy_bullets.remove(bullet)
-                    if player.health <= 0:
-                        state = "game_over"
+            for bullet in pygame.sprite.spritecollide(player, enemy_bullets, True):
+                player.health = max(0.0, player.health - bullet.damage)
+                damage_flash_timer = DAMAGE_FLASH_DURATION
+                owner = getattr(bullet, "owner", None)
+                if player.has_thorns and owner in enemies:
+                    owner.kill()
+                if player.health <= 0:
+                    state = "game_over"
 
             # Wave cleared?
             if not enemies and state == "playing":
                 wave += 1
                 should_choose_powerup = wave % 2 == 0
                 if should_choose_powerup:
-                    powerup_choices = random.sample(powerups, 3)
+                    powerup_choices = random.sample(POWERUPS, 3)
                     powerup_card_rects = build_powerup_card_rects(screen, len(powerup_choices))
                     state = "choosing"
                     pending_wave = wave
@@ -981,15 +1400,19 @@ def main() -> None:
             )
         else:
             background_color = BACKGROUND
-        screen.fill(background_color)
-        pygame.draw.rect(screen, GREY, (0, screen_rect.bottom - 12, screen_rect.width, 12))
+        # Nearly every sprite moves every frame, so the whole frame is redrawn and flipped;
+        # each group goes to the screen in a single blits call.
+        paint_background(screen, background_color)
         screen.blit(player.image, player.rect)
-        enemies.draw(screen)
+        screen.blits([(enemy.image, enemy.rect) for enemy in enemies], doreturn=False)
+        # Health labels sit on their enemies but under every shot and bouncy ball.
+        label_blits = []
         for enemy in enemies:
-            draw_text(screen, format_health(enemy.health), font, BACKGROUND, enemy.rect.center, "center")
-        player_bullets.draw(screen)
-        bouncy_balls.draw(screen)
-        enemy_bullets.draw(screen)
+            label = render_health_text(enemy.health, font)
+            label_blits.append((label, label.get_rect(center=enemy.rect.center)))
+        screen.blits(label_blits, doreturn=False)
+        for group in (player_bullets, bouncy_balls, enemy_bullets):
+            screen.blits([(sprite.image, sprite.rect) for sprite in group], doreturn=False)
         for laser in lasers:
             intensity = max(0.0, min(1.0, float(laser["timer"]) / LASER_DURATION))
             width = max(2, int(LASER_WIDTH * intensity))
@@ -998,32 +1421,31 @@ def main() -> None:
             pygame.draw.line(screen, LASER_GLOW, start, end, width + 4)
             pygame.draw.line(screen, LASER_COLOR, start, end, width)
         for effect in lightning_effects:
-            intensity = max(0.0, min(1.0, float(effect["timer"]) / LIGHTNING_DURATION))
-            core_color = tuple(
-                int(LIGHTNING_COLOR[i] * intensity + WHITE[i] * (1.0 - intensity) * 0.5) for i in range(3)
-            )
-            glow_color = tuple(min(255, int(value * 1.15)) for value in core_color)
-            line_width = max(1, int(4 * intensity))
-            for polyline in effect["polylines"]:
-                points = [(int(point.x), int(point.y)) for point in polyline]
+            step = int(effect.timer / LIGHTNING_DURATION * LIGHTNING_FADE_STEPS)
+            core_color, glow_color, line_width = LIGHTNING_STYLES[max(0, min(LIGHTNING_FADE_STEPS, step))]
+            for points in effect.polylines:
                 if len(points) >= 2:
                     pygame.draw.lines(screen, glow_color, False, points, line_width + 2)
                     pygame.draw.lines(screen, core_color, False, points, line_width)
 
-        draw_text(screen, f"Wave: {wave} | Enemies: {len(enemies)}", font, WHITE, (16, 12))
-        draw_text(screen, f"Health: {format_health(player.health)}/{format_health(player.max_health)}", font, WHITE, (16, 36))
-        draw_text(screen, "Move: A/D or arrows | Click to shoot", font, GREY, (16, 60))
-        draw_text(screen, "Press F11 to toggle fullscreen", font, GREY, (16, 84))
-        draw_text(screen, "Powerup every 2 waves | Survive the barrage!", font, GREY, (16, 108))
+        wave_key = (wave, len(enemies))
+        if wave_key != hud_wave_key:
+            hud_wave_key = wave_key
+            hud_wave_surf = font.render(f"Wave: {wave} | Enemies: {len(enemies)}", True, WHITE)
+        health_key = (format_health(player.health), format_health(player.max_health))
+        if health_key != hud_health_key:
+            hud_health_key = health_key
+            hud_health_surf = font.render(f"Health: {health_key[0]}/{health_key[1]}", True, WHITE)
+        screen.blit(hud_wave_surf, (16, 12))
+        screen.blit(hud_health_surf, (16, 36))
+        screen.blits(hint_blits, doreturn=False)
 
         if state == "choosing":
             draw_powerup_overlay(screen, font, title_font, powerup_choices, powerup_card_rects)
         elif state == "paused":
             draw_pause_overlay(screen, font, title_font, collected_powerups)
         elif state == "game_over":
-            overlay = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            screen.blit(overlay, (0, 0))
+            screen.blit(get_dim_overlay(screen.get_size()), (0, 0))
             draw_text(screen, "Game Over", title_font, RED, screen_rect.center, "center")
             draw_text(
                 screen,
@@ -1034,7 +1456,7 @@ def main() -> None:
                 "center",
             )
 
-        pygame.display.flip()
+        flip()
 
     pygame.quit()
 